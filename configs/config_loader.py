@@ -0,0 +1,87 @@
+import os
+import argparse
+from typing import Dict, Any, Tuple, Optional
+import yaml
+from dotenv import dotenv_values
+from configs.default_config import DEFAULT_CONFIG
+
+_config_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}  # (path, mtime) -> parsed config
+
+def _check_option(name: str, value: Any, action: Optional[argparse.Action]) -> Any:
+    """
+    Check a config value against its DEFAULT_CONFIG entry and argparse option, since
+    values installed with set_defaults skip argparse's own nargs, type and choices handling.
+
+    Args:
+        name (str): The option name.
+        value: The value from the config file.
+        action (argparse.Action, optional): The argparse option with the same name.
+
+    Returns:
+        The value, with a single file name wrapped in a list for list options.
+    """
+    default = DEFAULT_CONFIG[name]
+    if value is None:
+        if default is not None:
+            raise ValueError(f"Config option {name} cannot be empty.")
+        return value
+
+    if action is not None and action.nargs in ("*", "+"):
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ValueError(f"Config option {name} must be a string or a list of strings.")
+        return value
+
+    if (action is not None and action.nargs == 0) or isinstance(default, bool):
+        expected_type = bool  # store_true flags
+    elif action is not None and action.type is not None:
+        expected_type = action.type
+    else:
+        expected_type = type(default) if default is not None else str
+
+    if expected_type is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)  # e.g. a numeric model name parsed as a number
+    if not isinstance(value, expected_type) or (expected_type is int and isinstance(value, bool)):
+        raise ValueError(f"Config option {name} must be of type {expected_type.__name__}, got {value!r}.")
+
+    if action is not None and action.choices is not None and value not in action.choices:
+        raise ValueError(f"Config option {name} must be one of {', '.join(map(str, action.choices))}, got {value!r}.")
+    return value
+
+def load_config_file(path: str, options: Optional[Dict[str, argparse.Action]] = None) -> Dict[str, Any]:
+    """
+    Load configuration from a YAML or .env file and merge it over DEFAULT_CONFIG.
+    Unknown keys are an error in YAML files, but ignored in .env files, which also hold API keys.
+    Parsed files are cached by path and modification time.
+
+    Args:
+        path (str): Path of a .yaml/.yml file, or of a .env style KEY=value file.
+        options (dict, optional): Command line options keyed by destination name, the values are checked against them.
+
+    Returns:
+        dict: DEFAULT_CONFIG updated with the values from the file.
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _config_cache:
+        try:
+            if path.endswith((".yaml", ".yml")):
+                with open(path, "r") as file:
+                    file_config = yaml.safe_load(file) or {}
+                if not isinstance(file_config, dict):
+                    raise ValueError(f"Config file {path} must contain a mapping of option names to values.")
+                unknown_keys = set(file_config) - set(DEFAULT_CONFIG)
+                if unknown_keys:
+                    raise ValueError(f"Unknown config keys in {path}: {', '.join(sorted(unknown_keys))}")
+            else:
+                # .env values are plain strings, parse them as YAML scalars to get ints, bools and nulls.
+                file_config = {name.lower(): yaml.safe_load(value) if value else None
+                               for name, value in dotenv_values(path).items() if name.lower() in DEFAULT_CONFIG}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid config file {path}: {e}")
+        _config_cache[key] = file_config
+
+    options = options or {}
+    file_config = {name: _check_option(name, value, options.get(name))
+                   for name, value in _config_cache[key].items()}
+    return {**DEFAULT_CONFIG, **file_config}
@@ -10,5 +10,8 @@ DEFAULT_CONFIG = {
     "openai_base_url": None,  # Base URL for custom OpenAI endpoint
     "huggingface_model": "meta-llama/Llama-3.2-3B-Instruct",  # Default Hugging Face model ID
     "huggingface_device": "auto",  # Device for Hugging Face (auto, cpu, cuda)
+    "huggingface_quantization": None,  # bitsandbytes quantization for Hugging Face (None, 4bit, 8bit)
+    "huggingface_max_new_tokens": 4096,  # Maximum number of tokens Hugging Face generates per response
+    "huggingface_compile": False,  # Compile the Hugging Face model with torch.compile
     "gemini_model": "gemini-1.5-flash",  # Default Gemini model name
 }
\ No newline at end of file
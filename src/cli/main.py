@@ -7,26 +7,56 @@ from src.core.debugger import CodeDebugger
 from src.core.llm_factory import LLMFactory
 from datetime import datetime
 import re
+from typing import Dict, Tuple
 from configs.default_config import DEFAULT_CONFIG
+from configs.config_loader import load_config_file
 
 
 # Load environment variables from .env file
 load_dotenv()
 
-def main():
+def build_parser() -> Tuple[argparse.ArgumentParser, Dict[str, argparse.Action]]:
+    """
+    Build the command line parser of the debugger.
+
+    Returns:
+        tuple: The parser, and its options keyed by destination name, used to check config file values.
+    """
     parser = argparse.ArgumentParser(description="Debug Python code using an LLM.")
-    parser.add_argument("--code_dir", type=str, default=DEFAULT_CONFIG["code_dir"], help="The directory where the Python project files are located.")
-    parser.add_argument("--max_attempts", type=int, default=DEFAULT_CONFIG["max_attempts"], help="The maximum number of debugging attempts to make.")
-    parser.add_argument("--files_to_debug", type=str, nargs="*", help="Specific Python files to debug (space-separated). If not provided, all .py files in the code_dir will be debugged.")
-    parser.add_argument("--enable_internet_search", type=bool, default=DEFAULT_CONFIG["enable_internet_search"], help="Enable internet search during debugging, 'True' or 'False' (defaults to True)")
-    parser.add_argument("--num_search_urls", type=int, default=DEFAULT_CONFIG["num_search_urls"], help="Number of URLs to fetch during web search (defaults to 5)")
-    parser.add_argument("--internet_search_threshold", type=int, default=DEFAULT_CONFIG["internet_search_threshold"], help="Threshold for consecutive same error to trigger web search (defaults to 5)")
-    parser.add_argument("--llm_type", type=str, default=DEFAULT_CONFIG["llm_type"], choices=["openai", "huggingface", "gemini"], help="The type of LLM to use. Choices: 'openai', 'huggingface', 'gemini'")
-    parser.add_argument("--openai_model", type=str, default=DEFAULT_CONFIG["openai_model"], help="OpenAI model name (if using openai as llm)")
-    parser.add_argument("--openai_base_url", type=str, default=DEFAULT_CONFIG["openai_base_url"], help="Base url for openai custom endpoint (if using openai as llm)")
-    parser.add_argument("--huggingface_model", type=str, default=DEFAULT_CONFIG["huggingface_model"], help="HuggingFace model ID (if using huggingface as llm)")
-    parser.add_argument("--huggingface_device", type=str, default=DEFAULT_CONFIG["huggingface_device"], help="Device to use for HuggingFace. 'auto','cpu' or 'cuda' ")
-    parser.add_argument("--gemini_model", type=str, default=DEFAULT_CONFIG["gemini_model"], help="Gemini model name (if using gemini as llm)")
+    options: Dict[str, argparse.Action] = {}
+
+    def add_option(*args, **kwargs):
+        action = parser.add_argument(*args, **kwargs)
+        options[action.dest] = action
+
+    add_option("--config", type=str, help="YAML or .env file with default values for the options below. Options given on the command line take precedence.")
+    add_option("--code_dir", type=str, default=DEFAULT_CONFIG["code_dir"], help="The directory where the Python project files are located.")
+    add_option("--max_attempts", type=int, default=DEFAULT_CONFIG["max_attempts"], help="The maximum number of debugging attempts to make.")
+    add_option("--files_to_debug", type=str, nargs="*", help="Specific Python files to debug (space-separated). If not provided, all .py files in the code_dir will be debugged.")
+    add_option("--enable_internet_search", type=bool, default=DEFAULT_CONFIG["enable_internet_search"], help="Enable internet search during debugging, 'True' or 'False' (defaults to True)")
+    add_option("--num_search_urls", type=int, default=DEFAULT_CONFIG["num_search_urls"], help="Number of URLs to fetch during web search (defaults to 5)")
+    add_option("--internet_search_threshold", type=int, default=DEFAULT_CONFIG["internet_search_threshold"], help="Threshold for consecutive same error to trigger web search (defaults to 5)")
+    add_option("--llm_type", type=str, default=DEFAULT_CONFIG["llm_type"], choices=["openai", "huggingface", "gemini"], help="The type of LLM to use. Choices: 'openai', 'huggingface', 'gemini'")
+    add_option("--openai_model", type=str, default=DEFAULT_CONFIG["openai_model"], help="OpenAI model name (if using openai as llm)")
+    add_option("--openai_base_url", type=str, default=DEFAULT_CONFIG["openai_base_url"], help="Base url for openai custom endpoint (if using openai as llm)")
+    add_option("--huggingface_model", type=str, default=DEFAULT_CONFIG["huggingface_model"], help="HuggingFace model ID (if using huggingface as llm)")
+    add_option("--huggingface_device", type=str, default=DEFAULT_CONFIG["huggingface_device"], help="Device to use for HuggingFace. 'auto','cpu' or 'cuda' ")
+    add_option("--huggingface_quantization", type=str, default=DEFAULT_CONFIG["huggingface_quantization"], choices=["4bit", "8bit"], help="Quantize the HuggingFace model with bitsandbytes, '4bit' or '8bit' (defaults to no quantization)")
+    add_option("--huggingface_max_new_tokens", type=int, default=DEFAULT_CONFIG["huggingface_max_new_tokens"], help="Maximum number of tokens the HuggingFace model generates per response (defaults to 4096)")
+    add_option("--huggingface_compile", action="store_true", default=DEFAULT_CONFIG["huggingface_compile"], help="Compile the HuggingFace model with torch.compile (slow first response, faster afterwards)")
+    add_option("--gemini_model", type=str, default=DEFAULT_CONFIG["gemini_model"], help="Gemini model name (if using gemini as llm)")
+    return parser, options
+
+def main():
+    parser, options = build_parser()
+
+    # Values from the config file replace the DEFAULT_CONFIG defaults, explicit CLI flags still override them.
+    config_args, _ = parser.parse_known_args()
+    if config_args.config:
+        try:
+            parser.set_defaults(**load_config_file(config_args.config, options))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
 
     args = parser.parse_args()
 
@@ -54,7 +84,8 @@ def main():
     if args.llm_type == "openai":
         llm_config = {"model_name": args.openai_model, "base_url": args.openai_base_url}
     elif args.llm_type == "huggingface":
-        llm_config = {"model_id": args.huggingface_model, "device":args.huggingface_device}
+        llm_config = {"model_id": args.huggingface_model, "device":args.huggingface_device, "quantization":args.huggingface_quantization,
+                      "max_new_tokens":args.huggingface_max_new_tokens, "compile_model":args.huggingface_compile}
     elif args.llm_type == "gemini":
          llm_config = {"model_name":args.gemini_model}
 
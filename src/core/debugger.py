@@ -1,20 +1,32 @@
 import os
 import re
-import time
+import sys
 import asyncio
-import subprocess
-from typing import List, Dict, Optional, Any
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
+import json
+import hashlib
 import logging
+import traceback
+import aiofiles
 from src.core.llm import LLMInterface
 from src.prompts.system_prompts import SYSTEM_PROMPT
 from src.prompts.query_prompts import QUERY_SYSTEM_PROMPT
 from src.internet.search import internet_search
-from scrapling import Fetcher
-from src.core.utils import get_diff
+from src.core.utils import get_diff, CodeBlockParser
+from src.core import run_driver
+
+_QUERY_PATTERN = re.compile(r'search_query: "(.*?)"')
+_URL_CACHE_SIZE = 128
 
 class CodeDebugger:
     """
     A class to handle debugging of Python code using an LLM and web searches.
+
+    The code files are launched from a pool of spawned worker processes. Spawned workers import
+    the main module again, so scripts using the debugger must create it under `if __name__ == "__main__":`.
     """
 
     def __init__(self, code_dir: str, max_attempts: int, files_to_debug: Optional[List[str]],
@@ -42,9 +54,17 @@ class CodeDebugger:
         self.attempt_count = 0
         self.constant_error_count = 0
         self.last_error_signature = ""
+        self._error_cache: Dict[str, str] = {}  # Output of each file since the last code update.
+        self._tree_cache: Optional[str] = None  # Directory tree of code_dir, rebuilt when files are added.
+        self._code_cache: Dict[str, Tuple[int, str, str]] = {}  # filename -> (mtime, source, rendered prompt chunk)
+        self._file_hashes: Dict[str, bytes] = {}  # filename -> blake2b digest of its content on disk
+        self._url_cache: "OrderedDict[str, str]" = OrderedDict()  # url -> page text, least recently used first
         if not self.files_to_debug:
             logging.info("No files passed. Loading all files")
             self.files_to_debug = self._get_all_python_files() # Load all python files from the directory if not passed.
+        self._paths: Dict[str, str] = {f: os.path.join(self.code_dir, f) for f in self.files_to_debug}
+        self._num_workers = max(1, min(8, len(self.files_to_debug)))
+        self._pool: Optional[ProcessPoolExecutor] = None  # Started on first use, shut down by close().
 
     def _get_all_python_files(self)->List[str]:
         """
@@ -54,9 +74,46 @@ class CodeDebugger:
         return python_files
         
 
-    def _run_subprocess_and_capture_output(self, code_filename: str) -> str:
+    def _get_path(self, filename: str) -> str:
+        """
+        Get the path of a file in the code directory, joining it only the first time.
+
+        Args:
+            filename (str): The name of the file.
+
+        Returns:
+            str: The path of the file.
+        """
+        path = self._paths.get(filename)
+        if path is None:
+            path = self._paths[filename] = os.path.join(self.code_dir, filename)
+        return path
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the process pool that launches the code files, starting it the first time.
+        Spawned (not forked) helper processes keep the LLM-carrying process out of fork().
+
+        Returns:
+            ProcessPoolExecutor: The process pool.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._num_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def close(self):
+        """
+        Shut down the process pool. A later run starts a new one.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def _run_subprocess_and_capture_output(self, code_filename: str) -> str:
         """
-         Executes a Python file using subprocess, captures its output, and any errors.
+         Executes a Python file in a subprocess launched from the process pool, captures its output, and any errors.
+         The result is cached until the code files are next updated.
 
          Args:
              code_filename (str): The name of the Python file to execute.
@@ -64,47 +121,130 @@ class CodeDebugger:
          Returns:
              str: The standard output if successful, or standard error if it fails.
         """
+        if code_filename in self._error_cache:
+            return self._error_cache[code_filename]
+
+        returncode, stdout, stderr = await asyncio.get_running_loop().run_in_executor(
+            self._get_pool(), run_driver.run_process, [sys.executable, self._get_path(code_filename)]
+        )
+        if returncode != 0:
+            output = stderr.strip()
+        else:
+            output = stdout.strip()
+        self._error_cache[code_filename] = output
+        return output
+
+    async def _run_files_in_driver(self, code_filenames: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Executes several Python files in a single interpreter using the run driver,
+        so interpreter startup is paid once instead of once per file.
+
+        Args:
+            code_filenames (list): The names of the Python files to execute.
+
+        Returns:
+            dict: The output of each file keyed by file name, or None if the driver itself failed.
+        """
+        paths = [self._get_path(code_filename) for code_filename in code_filenames]
+        _, stdout, _ = await asyncio.get_running_loop().run_in_executor(
+            self._get_pool(), run_driver.run_process, [sys.executable, run_driver.__file__, *paths]
+        )
+        _, marker, results = stdout.rpartition(run_driver.RESULTS_MARKER)
+        if not marker:
+            return None
+        try:
+            outputs, _ = json.JSONDecoder().raw_decode(results)
+        except json.JSONDecodeError:
+            return None
+        return {code_filename: outputs[path] for code_filename, path in zip(code_filenames, paths)}
+
+    async def _check_syntax(self, code_filename: str) -> Optional[str]:
+        """
+        Compiles a Python file in-process, so syntax errors are found without starting an interpreter.
+
+        Args:
+            code_filename (str): The name of the Python file to check.
+
+        Returns:
+            str: A traceback for the compile error, or None if the file compiles.
+        """
+        code = await self._get_code(code_filename)
         try:
-            result = subprocess.run(
-                ["python", os.path.join(self.code_dir, code_filename)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            return e.stderr.strip()
+            compile(code, self._get_path(code_filename), "exec")
+        except (SyntaxError, ValueError) as e:  # ValueError for null bytes before Python 3.12
+            return "Traceback (most recent call last):\n" + "".join(traceback.format_exception_only(e)).rstrip()
+        return None
+
+    async def _run_all_files(self) -> List[str]:
+        """
+        Executes every file in files_to_debug. Uncached files are split into one shard per pool worker,
+        and the shards run concurrently, each in a single driver run. Files of a shard whose driver
+        fails are executed one subprocess per file.
+        Files with a syntax error are reported from an in-process compile and never executed.
+
+        Returns:
+            list: The output of each file, in the same order as files_to_debug.
+        """
+        uncached_files = [code_filename for code_filename in self.files_to_debug if code_filename not in self._error_cache]
+        syntax_errors = await asyncio.gather(*[self._check_syntax(code_filename) for code_filename in uncached_files])
+        for code_filename, syntax_error in zip(uncached_files, syntax_errors):
+            if syntax_error:
+                self._error_cache[code_filename] = syntax_error
+        uncached_files = [code_filename for code_filename in uncached_files if code_filename not in self._error_cache]
+        if len(uncached_files) > 1:
+            num_shards = min(self._num_workers, len(uncached_files))
+            shards = [uncached_files[index::num_shards] for index in range(num_shards)]
+            shard_outputs = await asyncio.gather(*[self._run_files_in_driver(shard) for shard in shards])
+            for outputs in shard_outputs:
+                if outputs is None:
+                    logging.warning("Run driver failed, executing its files one by one.")
+                else:
+                    self._error_cache.update(outputs)
+        return await asyncio.gather(
+            *[self._run_subprocess_and_capture_output(code_filename) for code_filename in self.files_to_debug]
+        )
 
     def _generate_directory_tree(self, start_path: str, indent: str = "") -> str:
         """
-        Recursively generates a directory tree structure as a string.
+        Generates a directory tree structure as a string.
 
         Args:
             start_path (str): The root directory path for the tree.
-            indent (str): The indentation string for each level of recursion.
+            indent (str): The indentation string for the first level.
 
         Returns:
             str: A formatted string representing the directory tree structure.
         """
-        tree_structure = ""
+        tree_lines: List[str] = []
+        self._collect_directory_tree(start_path, indent, tree_lines)
+        return "".join(tree_lines)
+
+    def _collect_directory_tree(self, start_path: str, indent: str, tree_lines: List[str]) -> None:
+        """
+        Recursively appends the lines of a directory tree structure to a list.
+
+        Args:
+            start_path (str): The root directory path for the tree.
+            indent (str): The indentation string for each level of recursion.
+            tree_lines (list): Lines collected so far, shared by the recursive calls.
+        """
         try:
-            items = os.listdir(start_path)
+            with os.scandir(start_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
         except PermissionError:
-            return f"{indent}[Permission Denied]\n"
+            tree_lines.append(f"{indent}[Permission Denied]\n")
+            return
 
-        for index, item in enumerate(items):
-            item_path = os.path.join(start_path, item)
-            is_last_item = index == len(items) - 1
+        for index, entry in enumerate(entries):
+            is_last_item = index == len(entries) - 1
             prefix = "└── " if is_last_item else "├── "
-            tree_structure += f"{indent}{prefix}{item}\n"
+            tree_lines.append(f"{indent}{prefix}{entry.name}\n")
 
-            if os.path.isdir(item_path):
+            if entry.is_dir(follow_symlinks=False):
                 new_indent = indent + ("    " if is_last_item else "│   ")
-                tree_structure += self._generate_directory_tree(item_path, new_indent)
-
-        return tree_structure
+                self._collect_directory_tree(entry.path, new_indent, tree_lines)
 
-    def _construct_prompt_for_llm(self, internet_content: str = "") -> str:
+    async def _construct_prompt_for_llm(self, internet_content: str = "") -> Tuple[str, Dict[str, str]]:
         """
         Creates a prompt string for the language model with file structure, code, and errors.
 
@@ -112,30 +252,30 @@ class CodeDebugger:
             internet_content (str, optional): Additional content from web searches. Defaults to "".
 
         Returns:
-            str: A formatted prompt string to be used with the language model.
+            tuple: A formatted prompt string to be used with the language model,
+                and a dictionary with filenames as keys and the source code in the prompt as values.
         """
-        directory_tree = self._generate_directory_tree(self.code_dir)
+        if self._tree_cache is None:
+            self._tree_cache = self._generate_directory_tree(self.code_dir)
+        directory_tree = self._tree_cache
 
         file_structure_prompt = f"""
         The file structure of the project is as follows:
         {directory_tree}
         """
 
-        all_code = ""
-        for code_filename in self.files_to_debug:
-            with open(os.path.join(self.code_dir, code_filename), "r") as file:
-                all_code += "# " + code_filename + "\n"
-                code = file.read()
-                all_code += code + "\n"
-                all_code += "_________________\n\n"
+        codes = await asyncio.gather(*[self._get_code(code_filename) for code_filename in self.files_to_debug])
+        all_code = "".join(self._code_cache[code_filename][2] for code_filename in self.files_to_debug)
+        source_map = dict(zip(self.files_to_debug, codes))
 
-        all_errors = ""
-        for code_filename in self.files_to_debug:
-            error_message = self._run_subprocess_and_capture_output(code_filename=code_filename)
+        error_parts: List[str] = []
+        error_messages = await self._run_all_files()
+        for code_filename, error_message in zip(self.files_to_debug, error_messages):
             if "Traceback" in error_message:
-                all_errors += f"# {code_filename}\n{error_message}\n_________________\n\n"
+                error_parts.append(f"# {code_filename}\n{error_message}\n_________________\n\n")
             else:
-                all_errors += f"# {code_filename} has no error.\n_________________\n\n"
+                error_parts.append(f"# {code_filename} has no error.\n_________________\n\n")
+        all_errors = "".join(error_parts)
 
         if internet_content:
             final_prompt_with_error = f"""
@@ -156,58 +296,143 @@ class CodeDebugger:
             error:
             {all_errors}
             """
-        return final_prompt_with_error
+        return final_prompt_with_error, source_map
+
+    async def _stream_code_from_llm(self, messages: List[Dict[str, str]], system_prompt: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Streams the language model's response and extracts code blocks as soon as they are complete.
+
+        Args:
+            messages (list): The messages to send to the language model.
+            system_prompt (str): The system prompt for the language model.
+
+        Yields:
+            tuple: A (filename, code) pair for each code block in the response.
+        """
+        chunks = iter(self.llm.generate_response_stream(messages = messages, system_prompt = system_prompt))
+        parser = CodeBlockParser()
+
+        def next_blocks() -> Optional[List[Tuple[str, str]]]:
+            chunk = next(chunks, None)
+            return None if chunk is None else parser.feed(chunk)
+
+        # Chunks are received and parsed on a worker thread, keeping both off the event loop.
+        pending_blocks = asyncio.ensure_future(asyncio.to_thread(next_blocks))
+        while True:
+            blocks = await pending_blocks
+            if blocks is None:
+                break
+            # Fetch the following chunk while the caller handles the code blocks of this one.
+            pending_blocks = asyncio.ensure_future(asyncio.to_thread(next_blocks))
+            for filename, code in blocks:
+                yield filename, code
+
+    async def _read_file(self, filename: str) -> str:
+        """
+        Reads a file from the code directory without blocking the event loop.
+
+        Args:
+            filename (str): The name of the file to read.
+
+        Returns:
+            str: The content of the file.
+        """
+        async with aiofiles.open(self._get_path(filename), "r") as file:
+            return await file.read()
+
+    async def _get_code(self, code_filename: str) -> str:
+        """
+        Get the source of a code file, reading it only if it changed on disk since it was cached.
+        The source is cached with its rendered prompt chunk and its hash.
+
+        Args:
+            code_filename (str): The name of the file.
+
+        Returns:
+            str: The content of the file.
+        """
+        mtime = os.stat(self._get_path(code_filename)).st_mtime_ns
+        cached = self._code_cache.get(code_filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        code = await self._read_file(code_filename)
+        self._code_cache[code_filename] = (mtime, code, f"# {code_filename}\n{code}\n_________________\n\n")
+        self._file_hashes[code_filename] = self._hash_code(code)
+        return code
+
+    async def _write_file(self, filename: str, code: str) -> None:
+        """
+        Writes a file to the code directory without blocking the event loop.
+
+        Args:
+            filename (str): The name of the file to write.
+            code (str): The content to write.
+        """
+        async with aiofiles.open(self._get_path(filename), "w") as file:
+            await file.write(code)
 
-    def _extract_code_from_llm_response(self, llm_response: str) -> Dict[str, str]:
+    @staticmethod
+    def _hash_code(code: str) -> bytes:
         """
-        Extracts code from the language model's response.
+        Computes a short digest of the code, used to detect unchanged files.
 
         Args:
-            llm_response(str): The raw text response from the language model.
+            code (str): The content of a file.
 
         Returns:
-            dict: A dictionary with filenames as keys and code as values.
+            bytes: The blake2b digest of the code.
         """
-        pattern = r"#\s(\S+)\n```python\n(.*?)\n```"
-        matches = re.findall(pattern, llm_response, re.DOTALL)
-        return {filename: code.strip() for filename, code in matches}
+        return hashlib.blake2b(code.encode(), digest_size=16).digest()
 
-    def _update_code_files(self, code_changes: Dict[str, str]) -> None:
+    async def _update_code_files(self, code_changes: Dict[str, str]) -> None:
         """
         Updates code files with the corrected code provided by the language model.
+        Files whose content is identical to what is on disk are not rewritten.
 
         Args:
             code_changes (dict): A dictionary of filename and code pairs.
         """
+        changed_files = {}
         for filename, code in code_changes.items():
-            with open(os.path.join(self.code_dir, filename), "w") as file:
-                file.write(code)
-
-    def _check_for_errors(self) -> bool:
+            code_hash = self._hash_code(code)
+            if self._file_hashes.get(filename) == code_hash:
+                continue
+            self._file_hashes[filename] = code_hash
+            changed_files[filename] = code
+
+        if changed_files:
+            # Files may import each other, so any write invalidates every cached result.
+            self._error_cache.clear()
+        for filename in changed_files:
+            self._code_cache.pop(filename, None)
+            if not os.path.exists(self._get_path(filename)):
+                self._tree_cache = None  # A new file changes the directory tree.
+        await asyncio.gather(*[self._write_file(filename, code) for filename, code in changed_files.items()])
+
+    async def _get_error_signature(self) -> str:
         """
-        Checks if there are any errors left in the code files.
+        Collects the tracebacks of all code files into a single signature.
 
         Returns:
-            bool: True if there is any error, otherwise False.
+            str: The concatenated tracebacks, or an empty string if there is no error.
         """
-        for code_filename in self.files_to_debug:
-            error_message = self._run_subprocess_and_capture_output(code_filename=code_filename)
-            if "Traceback" in error_message:
-                return True  # Error found
-        return False
+        error_messages = await self._run_all_files()
+        return "".join(error_message for error_message in error_messages if "Traceback" in error_message)
 
-    def _generate_search_query_for_google(self) -> str:
+    async def _generate_search_query_for_google(self) -> Optional[str]:
         """
         Generates a search query based on the code and error messages.
 
         Returns:
-           str: A single-line Google search query.
+           str: A single-line Google search query, or None if the LLM did not provide one.
         """
         
-        full_prompt_error = self._construct_prompt_for_llm()
+        full_prompt_error, _ = await self._construct_prompt_for_llm()
         llm_response = self.llm.generate_response(messages = [{"role": "user", "content": full_prompt_error}], system_prompt = QUERY_SYSTEM_PROMPT)
-        search_query = re.search(r'search_query: "(.*?)"', llm_response).group(1)
-        return search_query
+        match = _QUERY_PATTERN.search(llm_response)
+        if not match:
+            return None
+        return match.group(1)
 
     async def _fetch_internet_content(self, search_query: str, num_urls: int = 5) -> str:
         """
@@ -227,34 +452,54 @@ class CodeDebugger:
         if not urls:
             return ""
 
+        from scrapling import Fetcher  # Imported lazily, so pool workers that import this module stay small.
         fetcher = Fetcher(auto_match=False)
-        combined_content = ""
-        for url in urls[:num_urls]:
-            try:
-                page = fetcher.get(url, stealthy_headers=True)
-                content = page.get_all_text(ignore_tags=("script", "style"))
-                combined_content += f"### CONTENT FROM: {url}\n{content}\n\n"
-            except Exception as e:
-                logging.error(f"Error fetching {url}: {e}")
-        return combined_content
+
+        def fetch_page_text(url: str) -> str:
+            page = fetcher.get(url, stealthy_headers=True)
+            return page.get_all_text(ignore_tags=("script", "style"))
+
+        # Fetcher.get is blocking, so every uncached page is fetched on its own worker thread.
+        urls = urls[:num_urls]
+        new_urls = [url for url in urls if url not in self._url_cache]
+        contents = await asyncio.gather(*[asyncio.to_thread(fetch_page_text, url) for url in new_urls], return_exceptions=True)
+        for url, content in zip(new_urls, contents):
+            if isinstance(content, Exception):
+                logging.error(f"Error fetching {url}: {content}")
+                continue
+            self._url_cache[url] = content
+            if len(self._url_cache) > _URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+
+        content_parts: List[str] = []
+        for url in urls:
+            if url in self._url_cache:
+                self._url_cache.move_to_end(url)
+                content_parts.append(f"### CONTENT FROM: {url}\n{self._url_cache[url]}\n\n")
+        return "".join(content_parts)
 
     async def debug(self):
         """
         Main method to orchestrate the code debugging process using an LLM.
+        The process pool is shut down once debugging finishes.
+        """
+        try:
+            await self._debug_attempts()
+        finally:
+            self.close()
+
+    async def _debug_attempts(self):
+        """
+        Runs debugging attempts until all errors are fixed or max_attempts is reached.
         """
         guide_prompt = "I have code3.py that is giving me an error. Can you fix it?"
 
         error_exists = True
+        current_error_signature = await self._get_error_signature()
         while error_exists and self.attempt_count < self.max_attempts:
             self.attempt_count += 1
             logging.info(f"Attempt {self.attempt_count}...")
 
-            current_error_signature = ""
-            for code_filename in self.files_to_debug:
-                error_message = self._run_subprocess_and_capture_output(code_filename=code_filename)
-                if "Traceback" in error_message:
-                  current_error_signature+=error_message
-
             if current_error_signature == self.last_error_signature and current_error_signature!="":
                 self.constant_error_count += 1
             else:
@@ -263,26 +508,32 @@ class CodeDebugger:
 
             if self.enable_internet_search and self.constant_error_count >= self.internet_search_threshold:
                 logging.info(f"Same error detected for {self.internet_search_threshold} attempts, fetching internet information...")
-                search_query = self._generate_search_query_for_google()
-                logging.info(f"Generated Query {search_query}")
-                internet_content = await self._fetch_internet_content(search_query, num_urls = self.num_search_urls)
-                full_prompt_with_error = self._construct_prompt_for_llm(internet_content)
+                search_query = await self._generate_search_query_for_google()
+                if search_query:
+                    logging.info(f"Generated Query {search_query}")
+                    internet_content = await self._fetch_internet_content(search_query, num_urls = self.num_search_urls)
+                else:
+                    logging.warning("Could not generate a search query, continuing without internet information.")
+                    internet_content = ""
+                full_prompt_with_error, source_map = await self._construct_prompt_for_llm(internet_content)
                 self.constant_error_count = 0  # Reset the count since we used the web info.
 
             else:
-                full_prompt_with_error = self._construct_prompt_for_llm()
+                full_prompt_with_error, source_map = await self._construct_prompt_for_llm()
 
-            llm_response = self.llm.generate_response(messages = [{"role": "user", "content": full_prompt_with_error + guide_prompt}], system_prompt = SYSTEM_PROMPT)
-            code_changes = self._extract_code_from_llm_response(llm_response)
-            
-            # Get the current code before updating
+            # Each file is written as soon as its code block has been streamed.
+            code_changes = {}
             code_before_change = {}
-            for filename in code_changes:
-                with open(os.path.join(self.code_dir, filename), "r") as file:
-                    code_before_change[filename] = file.read()
-
-
-            self._update_code_files(code_changes)
+            messages = [{"role": "user", "content": full_prompt_with_error + guide_prompt}]
+            async for filename, code in self._stream_code_from_llm(messages, SYSTEM_PROMPT):
+                # Get the current code before updating, reusing the source already read for the prompt
+                if filename not in code_changes:
+                    if filename in source_map:
+                        code_before_change[filename] = source_map[filename]
+                    elif os.path.exists(self._get_path(filename)):
+                        code_before_change[filename] = await self._read_file(filename)
+                code_changes[filename] = code
+                await self._update_code_files({filename: code})
 
              # Create a change summary to show the difference
             change_summary = ""
@@ -301,10 +552,12 @@ class CodeDebugger:
                  logging.info("No changes has been made on this attempt.")
                 
 
-            error_exists = self._check_for_errors()
+            # The signature after this update is also the starting point of the next attempt.
+            current_error_signature = await self._get_error_signature()
+            error_exists = bool(current_error_signature)
             if error_exists:
                 logging.info("Error still exists. Trying again after a pause...")
-                time.sleep(2)
+                await asyncio.sleep(2)
             else:
                 logging.info("All errors fixed.")
 
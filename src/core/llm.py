@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 class LLMInterface(ABC):
     """Abstract base class for LLM interactions."""
@@ -7,4 +7,11 @@ class LLMInterface(ABC):
     @abstractmethod
     def generate_response(self, messages: List[Dict[str, str]], system_prompt: str = None) -> str:
         """Abstract method to generate a response from the LLM."""
-        pass
\ No newline at end of file
+        pass
+
+    def generate_response_stream(self, messages: List[Dict[str, str]], system_prompt: str = None) -> Iterator[str]:
+        """
+        Generate a response from the LLM as a stream of text chunks.
+        Defaults to yielding the full response at once for LLMs without streaming support.
+        """
+        yield self.generate_response(messages, system_prompt)
\ No newline at end of file
@@ -1,15 +1,17 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from src.core.llm import LLMInterface
-from src.llms.openai_llm import OpenAILLM
-from src.llms.huggingface_llm import HuggingFaceLLM
-from src.llms.gemini_llm import GeminiLLM
 
 class LLMFactory:
      """Factory class to create instances of the appropriate LLM."""
-     @staticmethod
-     def create_llm(llm_type:str, config:Dict[str,Any]=None) -> LLMInterface:
+     _instances: Dict[Tuple, LLMInterface] = {}
+
+     @classmethod
+     def create_llm(cls, llm_type:str, config:Dict[str,Any]=None) -> LLMInterface:
          """
          Create instances of the appropriate LLM.
+         Instances are cached per type and configuration, so model weights are only loaded once.
+         Backends are imported here rather than at module level, so importing the CLI
+         (as the debugger's spawned pool workers do) does not load torch/transformers.
 
          Args:
           llm_type (str): LLM to use
@@ -17,15 +19,25 @@ class LLMFactory:
          Returns:
           LLMInterface: Instance of the LLM.
          """
+         key = (llm_type, tuple(sorted((config or {}).items())))
+         if key in cls._instances:
+             return cls._instances[key]
+
          if llm_type == "openai":
              if not config:
                   raise ValueError("Model name is required for openai.")
-             return OpenAILLM(**config)
+             from src.llms.openai_llm import OpenAILLM
+             llm = OpenAILLM(**config)
          elif llm_type == "huggingface":
              if not config:
                  raise ValueError("Model id is required for huggingface.")
-             return HuggingFaceLLM(**config)
+             from src.llms.huggingface_llm import HuggingFaceLLM
+             llm = HuggingFaceLLM(**config)
          elif llm_type == "gemini":
-             return GeminiLLM(**config)
+             from src.llms.gemini_llm import GeminiLLM
+             llm = GeminiLLM(**(config or {}))
          else:
-           raise ValueError("Invalid LLM Type.")
\ No newline at end of file
+           raise ValueError("Invalid LLM Type.")
+
+         cls._instances[key] = llm
+         return llm
\ No newline at end of file
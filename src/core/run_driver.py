@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import runpy
+import traceback
+import tempfile
+import subprocess
+
+RESULTS_MARKER = "__RUN_DRIVER_RESULTS__"
+
+def _shadows_loaded_module(path):
+    """
+    Checks if the directory of a file holds a module with the name of one the driver already imported,
+    e.g. a local random.py. Under `python <path>` the local module would win, but here the import
+    would return the cached module instead.
+
+    Args:
+         path (str): Absolute path of the Python file to execute.
+
+    Returns:
+         bool: True if a module next to the file shadows an already imported module.
+    """
+    with os.scandir(os.path.dirname(path)) as entries:
+        for entry in entries:
+            if entry.name.endswith(".py"):
+                name = entry.name[:-3]
+            elif entry.is_dir() and os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                name = entry.name
+            else:
+                continue
+            if name in sys.modules:
+                return True
+    return False
+
+def run_file(path):
+    """
+    Executes a Python file as __main__ in the current interpreter and captures its output.
+    The working directory, environment, sys state and imported modules are restored afterwards,
+    so every file runs as if it was started with `python <path>`. Files next to a module that
+    shadows one the driver imported are started with `python <path>` in a subprocess instead.
+
+    Args:
+         path (str): Path of the Python file to execute.
+
+    Returns:
+         str: The standard output if successful, or standard error if it fails.
+    """
+    path = os.path.abspath(path)
+    if _shadows_loaded_module(path):
+        result = subprocess.run([sys.executable, path], capture_output=True, text=True)
+        output = result.stderr if result.returncode != 0 else result.stdout
+        return output.strip()
+
+    saved_cwd = os.getcwd()
+    saved_environ = dict(os.environ)
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    loaded_modules = set(sys.modules)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        # Point file descriptors 1 and 2 at temporary files, so the file gets real streams
+        # (buffer, fileno, reconfigure) and output from C code or child processes is captured too.
+        os.dup2(stdout_file.fileno(), 1)
+        os.dup2(stderr_file.fileno(), 2)
+        file_stdout = open(1, "w", closefd=False)
+        file_stderr = open(2, "w", errors="backslashreplace", closefd=False)
+        sys.stdout, sys.stderr = file_stdout, file_stderr
+        sys.argv = [path]
+        sys.path[0] = os.path.dirname(path)
+        failed = False
+        try:
+            runpy.run_path(path, run_name="__main__")
+        except SystemExit as e:
+            failed = e.code not in (None, 0)
+            if e.code is not None and not isinstance(e.code, int):
+                print(e.code, file=file_stderr)
+        except BaseException as e:
+            failed = True
+            # Start the traceback at the executed file, hiding the driver and runpy frames.
+            # If the error did not happen in the file itself, keep the full traceback.
+            tb = e.__traceback__
+            while tb is not None and tb.tb_frame.f_code.co_filename != path:
+                tb = tb.tb_next
+            traceback.print_exception(type(e), e, tb or e.__traceback__, file=file_stderr)
+        finally:
+            for stream in (file_stdout, file_stderr):
+                try:
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass  # The file closed or broke its own stream.
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+            sys.stdout, sys.stderr = saved_stdout, saved_stderr
+            sys.argv, sys.path[:] = saved_argv, saved_path
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_environ)
+            # Drop modules imported by this file so the next file starts from a clean import state.
+            for name in set(sys.modules) - loaded_modules:
+                del sys.modules[name]
+
+        output_file = stderr_file if failed else stdout_file
+        output_file.seek(0)
+        return output_file.read().decode(errors="replace").strip()
+
+def run_process(command):
+    """
+    Runs a command to completion and captures its output. Used by the debugger's process pool,
+    whose workers stay small, so the large debugger process is never forked to launch python.
+
+    Args:
+         command (list): The command and its arguments.
+
+    Returns:
+         tuple: The return code, standard output and standard error of the command.
+    """
+    result = subprocess.run(command, capture_output=True, text=True)
+    return result.returncode, result.stdout, result.stderr
+
+def main():
+    """
+    Runs every file passed on the command line and prints a JSON object of path -> output,
+    preceded by RESULTS_MARKER so it can be told apart from output the files wrote directly.
+    """
+    paths = sys.argv[1:]
+    results = {path: run_file(path) for path in paths}
+    sys.__stdout__.write(RESULTS_MARKER + json.dumps(results))
+    sys.__stdout__.flush()
+
+if __name__ == "__main__":
+    main()
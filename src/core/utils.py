@@ -1,17 +1,103 @@
+import re
 import difflib
+from itertools import islice
+from typing import List, Tuple
 
 def get_diff(old_lines, new_lines):
     """
     Compute the differences between two lists of lines.
+    Yields only the removed and added lines, without context.
     """
-    diff_lines = []
-    diff = difflib.Differ()
-    comparison = list(diff.compare(old_lines, new_lines))
-    for line in comparison:
-        if line.startswith("  "):
-            continue  # No change
-        elif line.startswith("- "):
-            diff_lines.append(f"  - {line[2:].strip()}\n")
-        elif line.startswith("+ "):
-            diff_lines.append(f"  + {line[2:].strip()}\n")
-    return diff_lines
\ No newline at end of file
+    diff = difflib.unified_diff(old_lines, new_lines, n=0, lineterm="")
+    for line in islice(diff, 2, None):  # Skip the "---" / "+++" file headers
+        if line.startswith("@@"):
+            continue  # Hunk marker
+        yield f"  {line[0]} {line[1:].strip()}\n"
+
+
+_CODE_HEADER_PATTERN = re.compile(r"#\s(\S+)\n```python\n")
+_CODE_HEADER_START_PATTERN = re.compile(r"#\s(\S*)")
+_CODE_HEADER_END = "\n```python\n"
+_CODE_FENCE = "\n```"
+
+class CodeBlockParser:
+    """
+    Incrementally extracts "# filename" + ```python code blocks from a streamed LLM response.
+    Every chunk is scanned once, so the total work stays linear in the size of the response.
+    """
+
+    def __init__(self):
+        self._pending_text = ""  # Text outside a code block that may still start a block header
+        self._filename = None  # Filename of the open code block, None outside a block
+        self._code_parts: List[str] = []
+        self._code_tail = ""  # Last characters of the open block, to find a fence split across chunks
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Parse the next chunk of the response.
+
+        Args:
+            chunk (str): The next piece of the response.
+
+        Returns:
+            list: A (filename, code) pair for each code block closed by this chunk.
+        """
+        blocks = []
+        while chunk:
+            if self._filename is None:
+                chunk = self._feed_text(chunk)
+            else:
+                chunk = self._feed_code(chunk, blocks)
+        return blocks
+
+    def _feed_text(self, chunk: str) -> str:
+        """
+        Look for a block header, returning the text after it or "" if there is none yet.
+        """
+        text = self._pending_text + chunk
+        match = _CODE_HEADER_PATTERN.search(text)
+        if match:
+            self._filename = match.group(1)
+            self._pending_text = ""
+            return text[match.end():]
+
+        # Keep only the text from the first "#" that could still grow into a header.
+        start = text.find("#")
+        while start != -1 and not self._is_header_prefix(text, start):
+            start = text.find("#", start + 1)
+        self._pending_text = text[start:] if start != -1 else ""
+        return ""
+
+    @staticmethod
+    def _is_header_prefix(text: str, start: int) -> bool:
+        """
+        Check whether text[start:] is the beginning of a block header.
+        """
+        match = _CODE_HEADER_START_PATTERN.match(text, start)
+        if not match:
+            return start == len(text) - 1  # A lone "#" at the end
+        rest_length = len(text) - match.end()
+        if rest_length == 0:
+            return True
+        return (bool(match.group(1)) and rest_length <= len(_CODE_HEADER_END)
+                and _CODE_HEADER_END.startswith(text[match.end():]))
+
+    def _feed_code(self, chunk: str, blocks: List[Tuple[str, str]]) -> str:
+        """
+        Look for the closing fence of the open block, returning the text after it or "" if it is still open.
+        """
+        window = self._code_tail + chunk
+        index = window.find(_CODE_FENCE)
+        if index == -1:
+            self._code_parts.append(chunk)
+            self._code_tail = window[-(len(_CODE_FENCE) - 1):]
+            return ""
+
+        fence_start = index - len(self._code_tail)  # Negative if the fence began in an earlier chunk
+        code = "".join(self._code_parts)
+        code = code[:len(code) + fence_start] if fence_start < 0 else code + chunk[:fence_start]
+        blocks.append((self._filename, code.strip()))
+        self._filename = None
+        self._code_parts = []
+        self._code_tail = ""
+        return chunk[fence_start + len(_CODE_FENCE):]
@@ -1,8 +1,12 @@
-from scrapling import StealthyFetcher
+from collections import OrderedDict
+
+_SEARCH_CACHE_SIZE = 128
+_search_cache = OrderedDict()  # search query -> result urls, least recently used first
 
 async def internet_search(search_query):
     """
-    Asynchronously searches the web using google and returns the first search results
+    Asynchronously searches the web using google and returns the first search results.
+    Results are cached per query, so a repeated query does not hit google again.
 
     Args:
          search_query (str): Search query for the google
@@ -10,9 +14,15 @@ async def internet_search(search_query):
     Returns:
          list: First url from the search
     """
+    if search_query in _search_cache:
+        _search_cache.move_to_end(search_query)
+        return _search_cache[search_query]
+
+    cache_key = search_query
     search_query = f'"{search_query}"'
     search_url = f"https://www.google.com/search?q={search_query}"
 
+    from scrapling import StealthyFetcher  # Imported lazily, so importing the debugger does not load scrapling.
     fetcher = StealthyFetcher()
 
     try:
@@ -22,6 +32,9 @@ async def internet_search(search_query):
         # first_url list take only the element start with https
         first_url = [url for url in first_url if url.startswith("https")]
 
+        _search_cache[cache_key] = first_url
+        if len(_search_cache) > _SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
         return first_url
     except Exception as e:
         print(f"An error occurred: {e}")
\ No newline at end of file
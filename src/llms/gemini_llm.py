@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict
+from typing import List, Dict, Iterator
 import google.generativeai as genai
 from src.core.llm import LLMInterface
 import logging
@@ -21,12 +21,24 @@ class GeminiLLM(LLMInterface):
           self.model = genai.GenerativeModel(model_name)
           logging.info("Gemini Client Initiated")
 
-      def generate_response(self, messages: List[Dict[str, str]], system_prompt: str=None) -> str:
-        """Generate a response from the Gemini API."""
+      @staticmethod
+      def _build_prompt(messages: List[Dict[str, str]], system_prompt: str=None) -> str:
+        """Join the system prompt and message contents into a single Gemini prompt."""
         prompt = ""
         if system_prompt:
               prompt += system_prompt
         for message in messages:
               prompt += message['content']
+        return prompt
+
+      def generate_response(self, messages: List[Dict[str, str]], system_prompt: str=None) -> str:
+        """Generate a response from the Gemini API."""
+        prompt = self._build_prompt(messages, system_prompt)
         response = self.model.generate_content(prompt)
-        return response.text
\ No newline at end of file
+        return response.text
+
+      def generate_response_stream(self, messages: List[Dict[str, str]], system_prompt: str=None) -> Iterator[str]:
+        """Generate a response from the Gemini API as a stream of text chunks."""
+        prompt = self._build_prompt(messages, system_prompt)
+        for chunk in self.model.generate_content(prompt, stream=True):
+              yield chunk.text
\ No newline at end of file
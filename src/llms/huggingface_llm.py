@@ -1,35 +1,95 @@
 import os
-from typing import List, Dict
+import copy
+import hashlib
+import importlib.util
+from typing import List, Dict, Tuple
 import torch
-from transformers import pipeline
+from transformers import pipeline, DynamicCache, BitsAndBytesConfig
 from src.core.llm import LLMInterface
 import logging
 
 class HuggingFaceLLM(LLMInterface):
      """Class to handle interactions with HuggingFace Transformers."""
-     def __init__(self, model_id:str, device:str = "auto"):
+     def __init__(self, model_id:str, device:str = "auto", compile_model:bool = False, quantization:str = None,
+                  max_new_tokens:int = 4096):
           """
            Initialise HuggingFaceLLM class.
 
            Args:
              model_id (str): Model id from huggingface.
              device (str): Device to use 'auto', 'cpu' or 'cuda'.
+             compile_model (bool): Compile the model with torch.compile (slow first call, faster afterwards).
+             quantization (str): Load the weights with bitsandbytes, '4bit' (NF4) or '8bit'. None keeps bfloat16.
+             max_new_tokens (int): Maximum number of tokens to generate per response.
           """
           self.model_id = model_id
           self.device = device
+          self.max_new_tokens = max_new_tokens
+          # flash-attention 2 needs the optional flash_attn package and a GPU, otherwise use PyTorch SDPA.
+          if device != "cpu" and importlib.util.find_spec("flash_attn") is not None:
+               attn_implementation = "flash_attention_2"
+          else:
+               attn_implementation = "sdpa"
+          model_kwargs = {"attn_implementation": attn_implementation}
+          if quantization == "4bit":
+               model_kwargs["quantization_config"] = BitsAndBytesConfig(
+                   load_in_4bit=True, bnb_4bit_compute_dtype=torch.bfloat16, bnb_4bit_quant_type="nf4"
+               )
+          elif quantization == "8bit":
+               model_kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+          elif quantization:
+               raise ValueError("Invalid quantization, use '4bit' or '8bit'.")
           self.pipe = pipeline(
               "text-generation",
               model=self.model_id,
               torch_dtype=torch.bfloat16,
               device_map=self.device,
+              model_kwargs=model_kwargs,
           )
+          self.model = self.pipe.model
+          if compile_model:
+               # generate() runs the module's own forward, so compile that rather than wrapping the module.
+               # dynamic=True since the prompt length and the DynamicCache grow between calls.
+               self.model.forward = torch.compile(self.model.forward, dynamic=True)
+          self.tokenizer = self.pipe.tokenizer
+          self._prefix_kv_cache: Dict[str, Tuple[torch.Tensor, DynamicCache]] = {}  # sha256(system prompt) -> (prefix ids, kv cache)
           logging.info("HuggingFace Client Initiated")
 
+     def _get_prefix_kv_cache(self, system_prompt:str) -> Tuple[torch.Tensor, DynamicCache]:
+           """
+           Get the key/value cache of the system prompt, running the prefill only the first time.
+
+           Args:
+             system_prompt (str): System prompt shared by the requests.
+           Returns:
+             tuple: Token ids of the prefix and the key/value cache computed for them.
+           """
+           key = hashlib.sha256(system_prompt.encode()).hexdigest()
+           if key not in self._prefix_kv_cache:
+                prefix_ids = self.tokenizer.apply_chat_template(
+                    [{"role": "system", "content": system_prompt}], return_tensors="pt"
+                ).to(self.model.device)
+                with torch.no_grad():
+                     prefix_cache = self.model(prefix_ids, past_key_values=DynamicCache()).past_key_values
+                self._prefix_kv_cache[key] = (prefix_ids, prefix_cache)
+           return self._prefix_kv_cache[key]
+
      def generate_response(self, messages: List[Dict[str, str]], system_prompt:str = None) -> str:
            """Generate a response from HuggingFace Transformers."""
            if system_prompt:
                 messages = [{"role": "system", "content": system_prompt}] + messages
-           outputs = self.pipe(
-              messages
-           )
-           return outputs[0]["generated_text"][-1]['content']
\ No newline at end of file
+           inputs = self.tokenizer.apply_chat_template(
+               messages, add_generation_prompt=True, return_dict=True, return_tensors="pt"
+           ).to(self.model.device)
+           input_ids = inputs["input_ids"]
+
+           generate_kwargs = {}
+           if system_prompt:
+                prefix_ids, prefix_cache = self._get_prefix_kv_cache(system_prompt)
+                prefix_length = prefix_ids.shape[-1]
+                # Only reuse the cache when the prompt really starts with the cached tokens.
+                if input_ids.shape[-1] > prefix_length and torch.equal(input_ids[:, :prefix_length], prefix_ids):
+                     generate_kwargs["past_key_values"] = copy.deepcopy(prefix_cache)
+
+           outputs = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens, **generate_kwargs)
+           return self.tokenizer.decode(outputs[0][input_ids.shape[-1]:], skip_special_tokens=True)
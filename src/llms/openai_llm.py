@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict
+from typing import List, Dict, Iterator
 from openai import OpenAI
 from src.core.llm import LLMInterface
 import logging
@@ -31,4 +31,17 @@ class OpenAILLM(LLMInterface):
             model=self.model_name,
             messages=messages,
         )
-        return completion.choices[0].message.content
\ No newline at end of file
+        return completion.choices[0].message.content
+
+     def generate_response_stream(self, messages: List[Dict[str, str]], system_prompt: str=None) -> Iterator[str]:
+        """Generate a response from the OpenAI API as a stream of text chunks."""
+        if system_prompt:
+             messages = [{"role": "system", "content": system_prompt}] + messages
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            stream=True,
+        )
+        for chunk in stream:
+             if chunk.choices and chunk.choices[0].delta.content:
+                  yield chunk.choices[0].delta.content
\ No newline at end of file
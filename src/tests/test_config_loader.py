@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from configs.config_loader import load_config_file
+from configs.default_config import DEFAULT_CONFIG
+from src.cli.main import build_parser
+
+class TestConfigLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser, self.options = build_parser()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, filename, content):
+        path = os.path.join(self.temp_dir.name, filename)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_yaml(self):
+        path = self._write("config.yaml", "max_attempts: 3\nenable_internet_search: false\nfiles_to_debug: [a.py, b.py]\nllm_type: gemini\n")
+        config = load_config_file(path, self.options)
+        self.assertEqual(config["max_attempts"], 3)
+        self.assertIs(config["enable_internet_search"], False)
+        self.assertEqual(config["files_to_debug"], ["a.py", "b.py"])
+        self.assertEqual(config["llm_type"], "gemini")
+        self.assertEqual(config["num_search_urls"], DEFAULT_CONFIG["num_search_urls"])
+
+    def test_env(self):
+        path = self._write("config.env", "MAX_ATTEMPTS=4\nENABLE_INTERNET_SEARCH=False\nFILES_TO_DEBUG=a.py\nOPENAI_BASE_URL=http://localhost:8000/v1\n")
+        config = load_config_file(path, self.options)
+        self.assertEqual(config["max_attempts"], 4)
+        self.assertIs(config["enable_internet_search"], False)
+        self.assertEqual(config["files_to_debug"], ["a.py"])
+        self.assertEqual(config["openai_base_url"], "http://localhost:8000/v1")
+
+    def test_env_ignores_other_keys(self):
+        path = self._write("config.env", "GEMINI_API_KEY=secret\nLLM_PROVIDER_API_KEY=sk-123\nMAX_ATTEMPTS=2\n")
+        config = load_config_file(path, self.options)
+        self.assertEqual(config["max_attempts"], 2)
+        self.assertNotIn("gemini_api_key", config)
+        self.assertNotIn("llm_provider_api_key", config)
+
+    def test_cli_flags_override_config(self):
+        path = self._write("config.yaml", "max_attempts: 3\nnum_search_urls: 2\n")
+        self.parser.set_defaults(**load_config_file(path, self.options))
+        args = self.parser.parse_args(["--max_attempts", "7"])
+        self.assertEqual(args.max_attempts, 7)
+        self.assertEqual(args.num_search_urls, 2)
+
+    def test_unknown_key(self):
+        path = self._write("config.yaml", "max_attempt: 3\n")
+        with self.assertRaisesRegex(ValueError, "max_attempt"):
+            load_config_file(path, self.options)
+
+    def test_invalid_choice(self):
+        path = self._write("config.yaml", "llm_type: claude\n")
+        with self.assertRaisesRegex(ValueError, "llm_type"):
+            load_config_file(path, self.options)
+
+    def test_invalid_type(self):
+        path = self._write("config.env", "MAX_ATTEMPTS=many\n")
+        with self.assertRaisesRegex(ValueError, "max_attempts"):
+            load_config_file(path, self.options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,82 @@
+import os
+import tempfile
 import unittest
+from src.core.debugger import CodeDebugger
+from src.core.llm import LLMInterface
 
-class TestDebugger(unittest.TestCase):
-    
-    def test_example(self):
-        self.assertEqual(1,1)
+class StubLLM(LLMInterface):
+
+    def generate_response(self, messages, system_prompt=None):
+        return ""
+
+class TestDebugger(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.code_dir = self.temp_dir.name
+        self._write("a.py", "print('a')\n")
+        self._write("b.py", "print('b')\n")
+        self.debugger = CodeDebugger(self.code_dir, 1, ["a.py", "b.py"], False, 1, 5, StubLLM())
+
+    def tearDown(self):
+        self.debugger.close()
+        self.temp_dir.cleanup()
+
+    def _write(self, filename, code):
+        path = os.path.join(self.code_dir, filename)
+        with open(path, "w") as file:
+            file.write(code)
+        return path
+
+    async def test_results_are_cached_until_a_write(self):
+        self.assertEqual(await self.debugger._run_all_files(), ["a", "b"])
+        self._write("a.py", "print('changed')\n")
+        self.assertEqual(await self.debugger._run_all_files(), ["a", "b"])
+
+        # Files may import each other, so writing b.py also drops the result of a.py.
+        await self.debugger._update_code_files({"b.py": "print('B')\n"})
+        self.assertEqual(self.debugger._error_cache, {})
+        self.assertEqual(await self.debugger._run_all_files(), ["changed", "B"])
+
+    async def test_pool_restarts_after_close(self):
+        self.assertEqual(await self.debugger._run_all_files(), ["a", "b"])
+        self.debugger.close()
+        await self.debugger._update_code_files({"a.py": "print('again')\n"})
+        self.assertEqual(await self.debugger._run_all_files(), ["again", "b"])
+
+    async def test_unchanged_code_is_not_rewritten(self):
+        path = os.path.join(self.code_dir, "a.py")
+        os.utime(path, ns=(10**18, 10**18))
+        await self.debugger._construct_prompt_for_llm()
+        error_cache, code_cache = dict(self.debugger._error_cache), dict(self.debugger._code_cache)
+
+        await self.debugger._update_code_files({"a.py": "print('a')\n"})
+        self.assertEqual(os.stat(path).st_mtime_ns, 10**18)
+        self.assertEqual(self.debugger._error_cache, error_cache)
+        self.assertEqual(self.debugger._code_cache, code_cache)
+
+    async def test_new_file_resets_tree_cache(self):
+        await self.debugger._construct_prompt_for_llm()
+        self.assertIsNotNone(self.debugger._tree_cache)
+
+        await self.debugger._update_code_files({"a.py": "print('x')\n"})
+        self.assertIsNotNone(self.debugger._tree_cache)
+
+        await self.debugger._update_code_files({"c.py": "print('c')\n"})
+        self.assertIsNone(self.debugger._tree_cache)
+        self.assertTrue(os.path.exists(os.path.join(self.code_dir, "c.py")))
+
+    async def test_syntax_errors(self):
+        self._write("a.py", "def f(:\n")
+        self._write("b.py", "x = 1\0\n")
+        outputs = await self.debugger._run_all_files()
+        for output in outputs:
+            self.assertTrue(output.startswith("Traceback (most recent call last):"))
+        self.assertIn("SyntaxError", outputs[0])
+        self.assertIn("null bytes", outputs[1])
+        # The sources read by the syntax check are reused for the prompt.
+        self.assertEqual(self.debugger._code_cache["b.py"][1], "x = 1\0\n")
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
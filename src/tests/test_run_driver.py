@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+from src.core import run_driver
+
+class TestRunDriver(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.code_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, filename, code):
+        path = os.path.join(self.code_dir, filename)
+        with open(path, "w") as file:
+            file.write(code)
+        return path
+
+    def _run_driver(self, *filenames):
+        # Run the driver the way the debugger does, from the code directory with relative paths.
+        result = subprocess.run([sys.executable, run_driver.__file__, *filenames],
+                                cwd=self.code_dir, capture_output=True, text=True)
+        _, _, results = result.stdout.rpartition(run_driver.RESULTS_MARKER)
+        return json.loads(results)
+
+    def test_captures_stdout(self):
+        path = self._write("ok.py", "print('hello')\n")
+        self.assertEqual(run_driver.run_file(path), "hello")
+
+    def test_stdout_is_a_real_stream(self):
+        path = self._write("buffer.py", "import sys\nsys.stdout.buffer.write(b'hi\\n')\nsys.stdout.fileno()\nsys.stdout.isatty()\n")
+        self.assertEqual(run_driver.run_file(path), "hi")
+
+    def test_exception_traceback_starts_at_file(self):
+        path = self._write("error.py", "raise ValueError('boom')\n")
+        output = run_driver.run_file(path)
+        self.assertTrue(output.startswith("Traceback (most recent call last):"))
+        self.assertIn(path, output)
+        self.assertIn("ValueError: boom", output)
+        self.assertNotIn("runpy", output)
+
+    def test_error_outside_file_keeps_full_traceback(self):
+        path = self._write("syntax.py", "def f(:\n")
+        output = run_driver.run_file(path)
+        self.assertTrue(output.startswith("Traceback (most recent call last):"))
+        self.assertIn("SyntaxError", output)
+
+    def test_exit_code(self):
+        path = self._write("exit.py", "import sys\nprint('out')\nsys.exit('bad input')\n")
+        self.assertEqual(run_driver.run_file(path), "bad input")
+
+    def test_state_is_restored(self):
+        path = self._write("state.py", "import os, sys\nos.chdir('/')\nsys.argv.append('x')\nsys.path.append('y')\n")
+        cwd, argv, sys_path = os.getcwd(), list(sys.argv), list(sys.path)
+        run_driver.run_file(path)
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual(sys.argv, argv)
+        self.assertEqual(sys.path, sys_path)
+
+    def test_chdir_does_not_affect_next_file(self):
+        self._write("a.py", "print('a')\n")
+        self._write("b.py", "import os\nos.chdir('/')\n")
+        self._write("c.py", "print('c')\n")
+        self.assertEqual(self._run_driver("a.py", "b.py", "c.py"), {"a.py": "a", "b.py": "", "c.py": "c"})
+
+    def test_imports_are_isolated(self):
+        self._write("helper.py", "X = 1\n")
+        self._write("a.py", "import helper\nhelper.X = 2\n")
+        self._write("b.py", "import helper\nprint(helper.X)\n")
+        self.assertEqual(self._run_driver("a.py", "b.py")["b.py"], "1")
+
+    def test_environment_is_isolated(self):
+        self._write("a.py", "import os\nos.environ['MODE'] = 'prod'\n")
+        self._write("b.py", "import os\nprint(os.environ.get('MODE', 'dev'))\n")
+        self.assertEqual(self._run_driver("a.py", "b.py")["b.py"], "dev")
+
+    def test_local_module_shadows_stdlib(self):
+        self._write("random.py", "def randint(a, b):\n    return 4\n")
+        self._write("dice.py", "import random\nprint(random.randint(1, 6))\n")
+        self._write("other.py", "print('other')\n")
+        self.assertEqual(self._run_driver("dice.py", "other.py"), {"dice.py": "4", "other.py": "other"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import re
+import random
+import unittest
+from src.core.utils import CodeBlockParser
+
+CODE_PATTERN = re.compile(r"#\s(\S+)\n```python\n(.*?)\n```", re.DOTALL)
+
+RESPONSE = (
+    "Here is the fix # for your code.\n"
+    "# main.py\n```python\nimport utils\n\nprint(utils.add(1, 2))  # comment\n```\n"
+    "Some notes with a #hashtag and # heading\n"
+    "# utils.py\n```python\ndef add(a, b):\n    return a + b\n\n```\n"
+    "# empty.py\n```python\n\n```"
+    "# not_code.py\n```bash\necho hi\n```\n"
+    "#\n```python\nx = 1\n```\n"
+)
+
+class TestCodeBlockParser(unittest.TestCase):
+
+    def _parse(self, chunks):
+        parser = CodeBlockParser()
+        blocks = []
+        for chunk in chunks:
+            blocks.extend(parser.feed(chunk))
+        return blocks
+
+    def _expected(self, text):
+        return [(filename, code.strip()) for filename, code in CODE_PATTERN.findall(text)]
+
+    def test_whole_response(self):
+        self.assertEqual(self._parse([RESPONSE]), self._expected(RESPONSE))
+
+    def test_single_character_chunks(self):
+        self.assertEqual(self._parse(list(RESPONSE)), self._expected(RESPONSE))
+
+    def test_random_chunk_boundaries(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            cuts = sorted(rng.sample(range(1, len(RESPONSE)), rng.randint(1, 40)))
+            chunks = [RESPONSE[start:end] for start, end in zip([0] + cuts, cuts + [len(RESPONSE)])]
+            self.assertEqual(self._parse(chunks), self._expected(RESPONSE))
+
+    def test_block_is_returned_when_its_fence_arrives(self):
+        parser = CodeBlockParser()
+        self.assertEqual(parser.feed("# a.py\n```python\nprint(1)\n``"), [])
+        self.assertEqual(parser.feed("`\n# b.py"), [("a.py", "print(1)")])
+
+    def test_large_block_is_linear(self):
+        text = "# big.py\n```python\n" + "x = 1\n" * 20000 + "```\n"
+        chunks = [text[index:index + 4] for index in range(0, len(text), 4)]
+        self.assertEqual(self._parse(chunks), self._expected(text))
+
+
+if __name__ == '__main__':
+    unittest.main()